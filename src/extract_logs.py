@@ -1,19 +1,54 @@
 import os
 import sys
 import datetime
-import re
 import argparse
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 import mmap
+import functools
+
+# How far ahead of the extraction start to ask the kernel to prefetch
+READAHEAD_SIZE = 64 * 1024 * 1024
+
+# How much of the end of the file to search for the last log date
+DATE_RANGE_TAIL_SIZE = 64 * 1024
+
+# Chunk size for the copy fallback and for counting extracted lines
+COPY_CHUNK_SIZE = 4 * 1024 * 1024
+
+# Write buffer for the output file, so fallback copies issue few large writes
+OUTPUT_BUFFER_SIZE = 1024 * 1024
+
+# Read size and offset alignment for the O_DIRECT copy path
+DIRECT_IO_CHUNK_SIZE = 4 * 1024 * 1024
+DIRECT_IO_ALIGNMENT = 4096
+
+# Bytes to prefetch around each candidate search probe
+PROBE_PREFETCH_SIZE = 8192
+
+# Below this span the search bisects instead of interpolating
+INTERPOLATION_MIN_SPAN = 1024 * 1024
+
+# Interpolation steps allowed to shrink the range by less than half before bisecting
+MAX_FAILED_INTERPOLATIONS = 3
 
 def parse_arguments():
     """Parse command line arguments."""
-    parser = argparse.ArgumentParser(description='Extract logs for a specific date from a large log file.')
-    parser.add_argument('date', type=str, help='Date in format YYYY-MM-DD')
+    parser = argparse.ArgumentParser(description='Extract logs for specific dates from a large log file.')
+    parser.add_argument('date', type=str, nargs='?', help='Date in format YYYY-MM-DD')
+    parser.add_argument('--dates', type=str,
+                        help='Comma-separated list of dates in format YYYY-MM-DD')
+    parser.add_argument('--from', dest='from_date', type=str,
+                        help='First date of an inclusive range of dates to extract')
+    parser.add_argument('--to', dest='to_date', type=str,
+                        help='Last date of an inclusive range of dates to extract')
     parser.add_argument('--file', type=str, default='logs_2024.log', 
                         help='Path to the log file')
     parser.add_argument('--output-dir', type=str, default='output',
                         help='Directory for output files')
+    parser.add_argument('--unsorted', action='store_true',
+                        help='Scan every line instead of searching, for logs that are not in date order')
+    parser.add_argument('--direct-io', action='store_true',
+                        help='Read the extracted range with O_DIRECT, bypassing the page cache (Linux only)')
     return parser.parse_args()
 
 def validate_date(date_str):
@@ -24,215 +59,516 @@ def validate_date(date_str):
         print(f"Error: Invalid date format. Please use YYYY-MM-DD format.")
         sys.exit(1)
 
+def get_target_dates(args):
+    """
+    Collect the dates to extract from the command line arguments.
+    Returns a list of (date string, datetime) pairs sorted by date, without duplicates.
+    """
+    if args.from_date or args.to_date:
+        if args.date or args.dates:
+            print("Error: Use either dates or --from/--to, not both.")
+            sys.exit(1)
+        if not (args.from_date and args.to_date):
+            print("Error: --from and --to must be used together.")
+            sys.exit(1)
+        
+        first_date = validate_date(args.from_date)
+        last_date = validate_date(args.to_date)
+        if last_date < first_date:
+            print("Error: --from must not be after --to.")
+            sys.exit(1)
+        days = [first_date + timedelta(days=i) for i in range((last_date - first_date).days + 1)]
+        targets = [(day.strftime("%Y-%m-%d"), day) for day in days]
+    else:
+        date_strs = [args.date] if args.date else []
+        if args.dates:
+            date_strs.extend(d.strip() for d in args.dates.split(',') if d.strip())
+        targets = [(date_str, validate_date(date_str)) for date_str in date_strs]
+    
+    if not targets:
+        print("Error: No dates given. Pass a date, --dates or --from/--to.")
+        sys.exit(1)
+    
+    # Keep the first spelling of each date so output file names follow the input
+    unique = {}
+    for date_str, target_date in targets:
+        unique.setdefault(date_key(target_date), (date_str, target_date))
+    return [unique[key] for key in sorted(unique)]
+
 def get_file_size(file_path):
     """Get the size of the file in bytes."""
     return os.path.getsize(file_path)
 
-def estimate_position(file_size, target_date, start_date, end_date):
+def parse_date_fast(buf, off=0):
     """
-    Estimate position in file based on date range.
-    Since logs are evenly distributed, we can estimate the position based on dates.
+    Parse a YYYY-MM-DD date at a fixed offset into a packed YYYYMMDD integer.
+    Does no validation; use parse_line_date for bytes that may not be a date.
+    """
+    return (int(buf[off:off + 4]) * 10000
+            + int(buf[off + 5:off + 7]) * 100
+            + int(buf[off + 8:off + 10]))
+
+def parse_line_date(buf, line_start):
     """
-    # Calculate the total days in the log range
-    total_days = (end_date - start_date).days
+    Return the packed date of the line starting at line_start, or None if the
+    line doesn't begin with a YYYY-MM-DD timestamp (e.g. a continuation line).
+    """
+    # Continuation lines almost never start with a digit, so reject them before slicing
+    if line_start >= len(buf) or not 0x30 <= buf[line_start] <= 0x39:
+        return None
+    head = buf[line_start:line_start + 10]
+    if len(head) < 10 or head[4] != 0x2D or head[7] != 0x2D:
+        return None
     
-    # Calculate the target day's position in that range
-    target_days = (target_date - start_date).days
+    # int() would also accept spaces, signs and underscores, so insist on ASCII digits
+    if not (head[0:4] + head[5:7] + head[8:10]).isdigit():
+        return None
     
-    # Estimate the position in the file
-    if total_days == 0:  # Avoid division by zero
-        return 0
+    # Reject impossible dates such as 2024-02-30 or 1234-56-78
+    key = parse_date_fast(head)
+    try:
+        date(key // 10000, key // 100 % 100, key % 100)
+    except ValueError:
+        return None
+    return key
+
+def date_key(d):
+    """Pack a date or datetime into the same YYYYMMDD integer as parse_date_fast."""
+    return d.year * 10000 + d.month * 100 + d.day
+
+def format_key(key):
+    """Format a packed YYYYMMDD integer as YYYY-MM-DD."""
+    return f"{key // 10000:04d}-{key // 100 % 100:02d}-{key % 100:02d}"
+
+def key_to_ordinal(key):
+    """Convert a packed YYYYMMDD integer to a proleptic Gregorian day number."""
+    return date(key // 10000, key // 100 % 100, key % 100).toordinal()
+
+def advise_access(mm, advice, start=0, length=None):
+    """
+    Hint the kernel about how a region of the memory map will be accessed.
+    `advice` is the name of an mmap.MADV_* constant; unsupported platforms are ignored.
+    """
+    flag = getattr(mmap, advice, None)
+    if flag is None or not hasattr(mm, 'madvise') or start >= len(mm):
+        return
+    if length is None:
+        length = len(mm) - start
     
-    estimated_position = int(file_size * (target_days / total_days))
-    return max(0, estimated_position)  # Ensure we don't return negative values
+    # madvise requires a page-aligned start address
+    aligned_start = start - start % mmap.PAGESIZE
+    try:
+        mm.madvise(flag, aligned_start, length + start - aligned_start)
+    except (OSError, ValueError):
+        pass
+
+def advise_file_sequential(file_obj, start, length):
+    """Tell the kernel a region of the file will be read sequentially (POSIX only)."""
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    try:
+        os.posix_fadvise(file_obj.fileno(), start, length, os.POSIX_FADV_SEQUENTIAL)
+    except OSError:
+        pass
 
-def find_first_timestamp_in_chunk(file_obj, position, chunk_size=8192):
+def copy_file_range_to(src, dst, start, length):
     """
-    Search for the first complete timestamp in a chunk starting from the given position.
-    Returns the position of the start of the line with the timestamp and the timestamp itself.
+    Copy `length` bytes starting at `start` in src to the current position of dst.
+    Uses os.sendfile so the data never enters user space, falling back to
+    chunked reads and writes where the platform doesn't support it.
     """
-    # Seek to the position
-    file_obj.seek(max(0, position - chunk_size // 2))
+    offset = start
+    remaining = length
     
-    # Read a chunk
-    chunk = file_obj.read(chunk_size)
+    if hasattr(os, 'sendfile'):
+        dst.flush()
+        try:
+            while remaining:
+                sent = os.sendfile(dst.fileno(), src.fileno(), offset, remaining)
+                if sent == 0:
+                    break
+                offset += sent
+                remaining -= sent
+        except OSError:
+            # e.g. macOS only supports sockets as the destination
+            pass
     
-    # Find the next newline
-    newline_pos = chunk.find(b'\n')
-    if newline_pos != -1:
-        # Move to the start of the next line
-        file_obj.seek(max(0, position - chunk_size // 2) + newline_pos + 1)
+    src.seek(offset)
+    while remaining:
+        data = src.read(min(remaining, COPY_CHUNK_SIZE))
+        if not data:
+            break
+        dst.write(data)
+        remaining -= len(data)
+
+def copy_file_range_direct(file_path, dst, start, length):
+    """
+    Copy `length` bytes starting at `start` in the file to dst using large
+    O_DIRECT reads, which skip the page cache on cold-cache runs.
+    Returns the number of lines copied, or None if O_DIRECT isn't supported.
+    """
+    if not hasattr(os, 'O_DIRECT') or not hasattr(os, 'preadv'):
+        return None
+    try:
+        fd = os.open(file_path, os.O_RDONLY | os.O_DIRECT)
+    except OSError:
+        return None
     
-    # Read a line which should now start with a timestamp
-    line = file_obj.readline()
+    # Anonymous maps are page aligned, as O_DIRECT requires
+    buf = mmap.mmap(-1, DIRECT_IO_CHUNK_SIZE)
+    end = start + length
+    aligned_start = start - start % DIRECT_IO_ALIGNMENT
+    offset = aligned_start
+    count = 0
+    try:
+        while offset < end:
+            try:
+                n = os.preadv(fd, [buf], offset)
+            except OSError:
+                # Some filesystems accept O_DIRECT at open but reject the reads
+                if offset == aligned_start:
+                    return None
+                raise
+            if n == 0:
+                break
+            
+            data = buf[max(start - offset, 0):min(n, end - offset)]
+            dst.write(data)
+            count += data.count(b'\n')
+            
+            offset += n
+            if n < DIRECT_IO_CHUNK_SIZE:
+                break
+    finally:
+        buf.close()
+        os.close(fd)
     
-    # Extract the timestamp using regex
-    timestamp_match = re.match(rb'(\d{4}-\d{2}-\d{2})', line)
+    return count
+
+def find_first_timestamp_in_chunk(mm, position):
+    """
+    Search for the first complete timestamp at or after the given position.
+    Returns the position of the start of the line with the timestamp and its
+    date packed as a YYYYMMDD integer.
+    """
+    size = len(mm)
     
-    if timestamp_match:
-        timestamp_str = timestamp_match.group(1).decode('utf-8')
-        try:
-            timestamp = datetime.strptime(timestamp_str, "%Y-%m-%d")
-            return file_obj.tell() - len(line), timestamp
-        except ValueError:
-            # If the regex matched but the datetime parsing failed, try the next line
-            return find_first_timestamp_in_chunk(file_obj, file_obj.tell(), chunk_size)
-    else:
-        # If no timestamp found, try another position
-        return find_first_timestamp_in_chunk(file_obj, file_obj.tell(), chunk_size)
+    while True:
+        # Move to the start of the next line (or stay put if already on one)
+        if position <= 0:
+            line_start = 0
+        else:
+            newline_pos = mm.find(b'\n', position - 1)
+            if newline_pos == -1:
+                raise ValueError(f"No timestamp found after position {position}")
+            line_start = newline_pos + 1
+        
+        if line_start + 10 > size:
+            raise ValueError(f"No timestamp found after position {position}")
+        
+        # Parse YYYY-MM-DD straight from the mapped bytes
+        key = parse_line_date(mm, line_start)
+        if key is not None:
+            return line_start, key
+        
+        # Not a timestamped line, try the next one
+        position = line_start + 1
 
-def binary_search_date(file_path, target_date, file_size, start_date, end_date):
+@functools.lru_cache(maxsize=None)
+def _load_kernel():
     """
-    Use binary search to find the approximate position where logs for the target date start.
-    Returns the position in the file where to start reading.
+    Import Numba and compile the --unsorted scan kernel on first use, so the
+    search path never pays for the import. Returns None if Numba isn't installed.
     """
-    with open(file_path, 'rb') as f:
-        # Create memory-mapped file object for faster access
-        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
-            # Initialize binary search bounds
-            left = 0
-            right = file_size
+    try:
+        import numba
+        import numpy as np
+    except ImportError:
+        return None
+    
+    @numba.njit(cache=True)
+    def find_day_spans_jit(buf, target_keys):
+        """
+        Compiled equivalent of the pure-Python loop in find_day_spans. target_keys
+        must be sorted; each span is labelled with the index of its key.
+        """
+        size = buf.shape[0]
+        starts = np.empty(1024, dtype=np.int64)
+        ends = np.empty(1024, dtype=np.int64)
+        labels = np.empty(1024, dtype=np.int64)
+        count = 0
+        current = -1
+        pos = 0
+        
+        while pos < size:
+            line_end = pos
+            while line_end < size and buf[line_end] != 10:
+                line_end += 1
+            if line_end < size:
+                line_end += 1
             
-            # Binary search loop
-            while left < right:
-                mid = (left + right) // 2
-                
-                # Find a complete log entry near the middle
-                try:
-                    pos, date = find_first_timestamp_in_chunk(mm, mid)
-                    
-                    # Compare the found date with the target date
-                    if date.date() < target_date.date():
-                        left = pos + 1
+            # Same checks as parse_line_date: ten bytes from the line start (even
+            # if that runs past the newline), ASCII digits, and a real calendar date
+            if pos + 10 <= size and buf[pos + 4] == 45 and buf[pos + 7] == 45:
+                dated = True
+                key = 0
+                for i in (0, 1, 2, 3, 5, 6, 8, 9):
+                    digit = np.int64(buf[pos + i]) - 48
+                    if digit < 0 or digit > 9:
+                        dated = False
+                        break
+                    key = key * 10 + digit
+                if dated:
+                    year = key // 10000
+                    month = key // 100 % 100
+                    day = key % 100
+                    if month == 2:
+                        leap = year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+                        month_days = 29 if leap else 28
+                    elif month == 4 or month == 6 or month == 9 or month == 11:
+                        month_days = 30
                     else:
-                        right = pos
-                except Exception as e:
-                    # If we encounter an error, adjust the search space
-                    print(f"Warning: Error during binary search at position {mid}: {e}")
-                    
-                    # Estimate a new position based on the target date
-                    estimated_pos = estimate_position(file_size, target_date, start_date, end_date)
-                    
-                    # Move the search space
-                    if mid > estimated_pos:
-                        right = mid - 1
+                        month_days = 31
+                    dated = year >= 1 and 1 <= month <= 12 and 1 <= day <= month_days
+                if dated:
+                    index = np.searchsorted(target_keys, key)
+                    if index < target_keys.shape[0] and target_keys[index] == key:
+                        current = index
                     else:
-                        left = mid + 1
+                        current = -1
             
-            # Once we've narrowed down the position, find the first log entry for the target date
-            # Start searching a bit before the identified position to ensure we don't miss anything
-            search_start = max(0, left - 100000)  # Look back ~100KB to be safe
-            mm.seek(search_start)
-            
-            # Find the first line that starts with a date
-            line = mm.readline()
-            while line:
-                timestamp_match = re.match(rb'(\d{4}-\d{2}-\d{2})', line)
-                if timestamp_match:
-                    timestamp_str = timestamp_match.group(1).decode('utf-8')
-                    try:
-                        entry_date = datetime.strptime(timestamp_str, "%Y-%m-%d")
-                        # If we found an entry with a date before our target, keep searching
-                        if entry_date.date() < target_date.date():
-                            line = mm.readline()
-                            continue
-                        # If we found our target date or later, return this position
-                        return search_start + (mm.tell() - len(line))
-                    except ValueError:
-                        pass
-                
-                line = mm.readline()
-                search_start = mm.tell() - len(line)
-            
-            # If we couldn't find the exact start, return the estimated position
-            return estimate_position(file_size, target_date, start_date, end_date)
+            if current >= 0:
+                if count > 0 and ends[count - 1] == pos and labels[count - 1] == current:
+                    ends[count - 1] = line_end
+                else:
+                    if count == starts.shape[0]:
+                        starts = np.concatenate((starts, np.empty_like(starts)))
+                        ends = np.concatenate((ends, np.empty_like(ends)))
+                        labels = np.concatenate((labels, np.empty_like(labels)))
+                    starts[count] = pos
+                    ends[count] = line_end
+                    labels[count] = current
+                    count += 1
+            pos = line_end
+        
+        return starts[:count], ends[:count], labels[:count]
+    
+    def find_day_spans_numba(mm, target_keys):
+        sorted_keys = sorted(target_keys)
+        buf = np.frombuffer(mm, dtype=np.uint8, count=len(mm))
+        starts, ends, labels = find_day_spans_jit(buf, np.array(sorted_keys, dtype=np.int64))
+        del buf  # release the export so the mmap can be closed
+        
+        spans = {key: [] for key in target_keys}
+        for start, end, label in zip(starts.tolist(), ends.tolist(), labels.tolist()):
+            spans[sorted_keys[label]].append((start, end))
+        return spans
+    
+    return find_day_spans_numba
 
-def get_log_date_range(file_path):
+def find_day_spans(mm, target_keys):
     """
-    Determine the date range of logs in the file.
-    Returns tuple of (start_date, end_date).
+    Scan every line once for entries on any of the target dates, for logs that are
+    not in date order. Continuation lines follow the entry above them. Returns a dict
+    mapping each target key to its list of (start, end) byte ranges, with adjacent
+    lines merged into one range.
     """
-    start_date = None
-    end_date = None
-    
-    with open(file_path, 'rb') as f:
-        # Check the beginning of the file
-        line = f.readline()
-        timestamp_match = re.match(rb'(\d{4}-\d{2}-\d{2})', line)
-        if timestamp_match:
-            start_date_str = timestamp_match.group(1).decode('utf-8')
-            start_date = datetime.strptime(start_date_str, "%Y-%m-%d")
+    kernel = _load_kernel()
+    if kernel is not None:
+        return kernel(mm, target_keys)
+    
+    spans = {key: [] for key in target_keys}
+    current = None
+    pos = 0
+    size = len(mm)
+    
+    while pos < size:
+        newline_pos = mm.find(b'\n', pos)
+        line_end = size if newline_pos == -1 else newline_pos + 1
         
-        # Go to the end of the file and read the last few lines
-        f.seek(max(0, os.path.getsize(file_path) - 50000))  # Read last ~50KB
-        last_lines = f.read()
-        last_timestamp_match = re.findall(rb'(\d{4}-\d{2}-\d{2})', last_lines)
-        if last_timestamp_match:
-            end_date_str = last_timestamp_match[-1].decode('utf-8')
-            end_date = datetime.strptime(end_date_str, "%Y-%m-%d")
+        key = parse_line_date(mm, pos)
+        if key is not None:
+            current = spans.get(key)
+        
+        if current is not None:
+            if current and current[-1][1] == pos:
+                current[-1] = (current[-1][0], line_end)
+            else:
+                current.append((pos, line_end))
+        pos = line_end
+    
+    return spans
+
+def binary_search_date(mm, target_key, file_size, start_key, end_key, low=0):
+    """
+    Use interpolation search, with a binary search fallback, to find where logs for
+    the target date start. Only entries from `low` onwards are searched; every entry
+    before it must be before the target date, and start_key is the date at `low`.
+    Returns the start of the first log entry on or after the target date, or the
+    file size if there is none.
+    """
+    # Probes jump around the file, so readahead would only waste I/O
+    advise_access(mm, 'MADV_RANDOM')
+    
+    target_day = key_to_ordinal(target_key)
+    
+    # Invariant: every log entry starting before `left` is before the target date,
+    # and no entry starts in [right, first_match), where first_match is the earliest
+    # entry found on or after the target date (or the end of the file)
+    left = low
+    right = file_size
+    first_match = file_size
+    left_day = key_to_ordinal(start_key)
+    right_day = key_to_ordinal(end_key) + 1
+    failed_steps = 0
+    
+    # Interpolation search loop, falling back to bisection
+    while left < right:
+        span = right - left
+        interpolate = (span > INTERPOLATION_MIN_SPAN
+                       and failed_steps < MAX_FAILED_INTERPOLATIONS
+                       and left_day < target_day <= right_day)
+        if interpolate:
+            # Logs are evenly distributed, so estimate where the target day
+            # starts from the days seen at both bounds
+            fraction = (target_day - left_day - 0.5) / (right_day - left_day)
+            mid = min(max(left + int(span * fraction), left), right - 1)
+        else:
+            mid = (left + right) // 2
+        
+        # Start paging in both candidates for the next probe while this one is parsed
+        advise_access(mm, 'MADV_WILLNEED', (left + mid) // 2, PROBE_PREFETCH_SIZE)
+        advise_access(mm, 'MADV_WILLNEED', (mid + right) // 2, PROBE_PREFETCH_SIZE)
+        
+        # Find a complete log entry at or after the probe
+        try:
+            pos, found_key = find_first_timestamp_in_chunk(mm, mid)
+        except ValueError:
+            pos = file_size
+        
+        # Compare the found date with the target date
+        if pos >= right:
+            # No log entry starts between the probe and the right bound
+            right = mid
+        elif found_key < target_key:
+            left = pos + 1
+            left_day = key_to_ordinal(found_key)
+        else:
+            first_match = right = pos
+            right_day = key_to_ordinal(found_key)
+        
+        # An interpolation step that doesn't beat bisection counts as failed
+        if interpolate and right - left > span // 2:
+            failed_steps += 1
+    
+    return first_match
+
+def get_log_date_range(mm, file_size):
+    """
+    Determine the date range of logs in the memory-mapped file.
+    Returns tuple of (start_key, end_key) as packed YYYYMMDD integers.
+    """
+    end_key = None
+    
+    # Check the beginning of the file
+    start_key = parse_line_date(mm, 0)
+    
+    # Walk back from the end of the file to the last line that starts with a date
+    window_start = max(0, file_size - DATE_RANGE_TAIL_SIZE)
+    search_end = file_size
+    while search_end > window_start:
+        newline_pos = mm.rfind(b'\n', window_start, search_end)
+        if newline_pos == -1 and window_start > 0:
+            break
+        end_key = parse_line_date(mm, newline_pos + 1)
+        if end_key is not None:
+            break
+        search_end = newline_pos
     
     # If we couldn't determine the date range, use reasonable defaults
-    if not start_date:
-        start_date = datetime.now() - timedelta(days=365*3)  # Assume 3 years of logs
-    if not end_date:
-        end_date = datetime.now()
+    if start_key is None:
+        start_key = date_key(datetime.now() - timedelta(days=365*3))  # Assume 3 years of logs
+    if end_key is None:
+        end_key = date_key(datetime.now())
     
-    return start_date, end_date
+    return start_key, end_key
 
-def extract_logs_for_date(file_path, start_position, target_date, output_file):
+def extract_logs_for_date(log_file, mm, start_position, end_position, output_file, direct_io=False):
     """
-    Extract logs for the specified date starting from the given position.
-    Writes matching logs to the output file.
+    Extract the logs between the start and end positions of the target date.
+    Writes the slice to the output file and returns the number of lines written,
+    continuation lines included. With direct_io the slice is read with O_DIRECT where the platform allows it.
     """
-    target_date_str = target_date.strftime("%Y-%m-%d")
-    next_date = (target_date + timedelta(days=1)).strftime("%Y-%m-%d")
+    # Keep the slice inside the file and in order
+    end_position = min(max(end_position, start_position), len(mm))
+    start_position = min(start_position, end_position)
+    length = end_position - start_position
     
-    count = 0
-    with open(file_path, 'rb') as f:
-        with open(output_file, 'w', encoding='utf-8') as out:
-            f.seek(start_position)
+    with open(output_file, 'wb', buffering=OUTPUT_BUFFER_SIZE) as out:
+        count = None
+        if direct_io:
+            count = copy_file_range_direct(log_file.name, out, start_position, length)
+            if count is None:
+                print("Warning: O_DIRECT is not supported for this file, using a regular copy.")
+        
+        if count is None:
+            # The slice is read front to back, so enable aggressive readahead
+            advise_access(mm, 'MADV_SEQUENTIAL', start_position, length)
+            advise_access(mm, 'MADV_WILLNEED', start_position, min(length, READAHEAD_SIZE))
+            advise_file_sequential(log_file, start_position, length)
             
-            # Read and process lines until we reach the next day
-            for line in f:
-                try:
-                    line_decoded = line.decode('utf-8', errors='replace')
-                    
-                    # Check if the line starts with our target date
-                    if line_decoded.startswith(target_date_str):
-                        out.write(line_decoded)
-                        count += 1
-                    
-                    # If we've reached the next day, we're done
-                    elif line_decoded.startswith(next_date):
-                        break
-                    
-                    # Skip lines that don't start with a date (might be continuation of a previous log)
-                    # But check if we need to handle multiline logs that should be included
-                    elif count > 0 and not re.match(r'^\d{4}-\d{2}-\d{2}', line_decoded):
-                        out.write(line_decoded)
-                except UnicodeDecodeError:
-                    # Handle potential decode errors gracefully
-                    continue
+            # Write the whole day (including multiline continuations) as a single range
+            copy_file_range_to(log_file, out, start_position, length)
+            
+            # Count lines in bounded chunks rather than materializing the whole day
+            count = 0
+            for chunk_start in range(start_position, end_position, COPY_CHUNK_SIZE):
+                chunk_end = min(chunk_start + COPY_CHUNK_SIZE, end_position)
+                count += mm[chunk_start:chunk_end].count(b'\n')
+    
+    # An unterminated last line in the file is still a line
+    if length and mm[end_position - 1] != 0x0A:
+        count += 1
     
     return count
 
+def extract_logs_unsorted(log_file, mm, output_files):
+    """
+    Extract logs for several dates from a file that isn't in date order, in a single
+    pass. output_files maps each packed target date to its output path.
+    Returns a dict mapping each target date to the number of lines written.
+    """
+    # The whole file is read front to back
+    advise_access(mm, 'MADV_SEQUENTIAL')
+    advise_file_sequential(log_file, 0, len(mm))
+    
+    spans = find_day_spans(mm, list(output_files))
+    counts = {}
+    for target_key, output_file in output_files.items():
+        count = 0
+        with open(output_file, 'wb', buffering=OUTPUT_BUFFER_SIZE) as out:
+            for start, end in spans[target_key]:
+                chunk = mm[start:end]
+                out.write(chunk)
+                count += chunk.count(b'\n')
+                if not chunk.endswith(b'\n'):
+                    count += 1
+        counts[target_key] = count
+    
+    return counts
+
 def main():
     # Parse command line arguments
     args = parse_arguments()
     
-    # Validate input date
-    target_date = validate_date(args.date)
-    
-    # Set output directory to "output" regardless of args
-    output_dir = "../output"
+    # Validate input dates
+    targets = get_target_dates(args)
     
     # Ensure output directory exists
-    os.makedirs(output_dir, exist_ok=True)
+    os.makedirs(args.output_dir, exist_ok=True)
     
-    # Define output file path
-    output_file = os.path.join(output_dir, f"output_{args.date}.txt")
-    
-    print(f"Extracting logs for {args.date} from {args.file}")
+    date_list = ', '.join(date_str for date_str, _ in targets)
+    print(f"Extracting logs for {date_list} from {args.file}")
     
     # Check if file exists
     if not os.path.exists(args.file):
@@ -243,24 +579,56 @@ def main():
     file_size = get_file_size(args.file)
     print(f"Log file size: {file_size / (1024**3):.2f} GB")
     
-    # Get log date range
-    start_date, end_date = get_log_date_range(args.file)
-    print(f"Log date range: {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}")
-    
-    # Check if target date is within range
-    if target_date.date() < start_date.date() or target_date.date() > end_date.date():
-        print(f"Warning: Target date {args.date} is outside the log date range.")
-    
-    # Find the start position for the target date
-    print("Searching for target date position...")
-    start_position = binary_search_date(args.file, target_date, file_size, start_date, end_date)
-    print(f"Starting extraction from position {start_position}")
-    
-    # Extract logs for the target date
-    count = extract_logs_for_date(args.file, start_position, target_date, output_file)
-    
-    print(f"Extracted {count} log entries for {args.date}")
-    print(f"Results saved to {output_file}")
+    # Map the log file once and share it across the helpers and all target dates
+    with open(args.file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        # Get log date range
+        start_key, end_key = get_log_date_range(mm, file_size)
+        print(f"Log date range: {format_key(start_key)} to {format_key(end_key)}")
+        
+        output_files = {date_key(target_date): os.path.join(args.output_dir, f"output_{date_str}.txt")
+                        for date_str, target_date in targets}
+        
+        if args.unsorted:
+            # Dates are interleaved, so no search can bound them; one scan collects every target date
+            print("Scanning all lines for the target dates...")
+            unsorted_counts = extract_logs_unsorted(f, mm, output_files)
+        
+        # Dates are sorted, so each search can start where the previous day ended
+        cursor = 0
+        cursor_key = None
+        
+        for date_str, target_date in targets:
+            target_key = date_key(target_date)
+            output_file = output_files[target_key]
+            
+            # Check if target date is within range
+            if target_key < start_key or target_key > end_key:
+                print(f"Warning: Target date {date_str} is outside the log date range.")
+            
+            if args.unsorted:
+                count = unsorted_counts[target_key]
+            else:
+                # Find the start and end positions for the target date; the day ends where
+                # the next one starts. Consecutive dates share a boundary, so the previous
+                # end is reused as this start.
+                print("Searching for target date position...")
+                next_key = date_key(target_date + timedelta(days=1))
+                if cursor_key == target_key:
+                    start_position = cursor
+                else:
+                    start_position = binary_search_date(mm, target_key, file_size,
+                                                        cursor_key or start_key, end_key, low=cursor)
+                end_position = binary_search_date(mm, next_key, file_size, target_key, end_key,
+                                                  low=start_position)
+                cursor, cursor_key = end_position, next_key
+                print(f"Extracting from position {start_position} to {end_position}")
+                
+                # Extract logs for the target date
+                count = extract_logs_for_date(f, mm, start_position, end_position, output_file,
+                                              direct_io=args.direct_io)
+            
+            print(f"Extracted {count} log lines for {date_str}")
+            print(f"Results saved to {output_file}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,181 @@
+import mmap
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import extract_logs
+
+
+def write_log(path, lines):
+    with open(path, 'wb') as f:
+        f.write(b''.join(lines))
+
+
+def build_sorted_log(days=20, entries_per_day=200):
+    """Sorted log with continuation lines that have digits and hyphens in the date positions."""
+    lines = []
+    start = date(2024, 1, 1)
+    for day in range(days):
+        day_str = (start + timedelta(days=day)).isoformat().encode()
+        for i in range(entries_per_day):
+            lines.append(day_str + b'T00:00:00 - INFO - entry %d\n' % i)
+            if i % 7 == 0:
+                lines.append(b'1234-56-7890 stack frame id\n')
+            if i % 11 == 0:
+                lines.append(b'2024- 1-05 not a timestamp\n')
+    # An impossible date on the last line must not be taken as the end of the range
+    lines.append(b'2024-02-30 bogus trailer\n')
+    return lines
+
+
+class ParseLineDateTest(unittest.TestCase):
+    def test_accepts_real_dates(self):
+        self.assertEqual(extract_logs.parse_line_date(b'2024-02-29 x', 0), 20240229)
+        self.assertEqual(extract_logs.parse_line_date(b'x\n2024-01-05', 2), 20240105)
+
+    def test_rejects_lines_with_digits_in_date_positions(self):
+        for line in (b'1234-56-7890 stack frame id', b'2024-02-30 x', b'2023-02-29 x',
+                     b'9999-99-99 x', b'2024- 1-05 x', b'+024-01-01 x', b'2_24-01-01 x',
+                     b'2024-01-0\n5', b'0000-01-01 x'):
+            self.assertIsNone(extract_logs.parse_line_date(line, 0), line)
+
+
+class SearchTest(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix='.log')
+        os.close(fd)
+        self.lines = build_sorted_log()
+        write_log(self.path, self.lines)
+        self.f = open(self.path, 'rb')
+        self.mm = mmap.mmap(self.f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def tearDown(self):
+        self.mm.close()
+        self.f.close()
+        os.remove(self.path)
+
+    def expected_start(self, target):
+        offset = 0
+        for line in self.lines:
+            if line[:10].decode() >= target and extract_logs.parse_line_date(line, 0) is not None:
+                return offset
+            offset += len(line)
+        return offset
+
+    def test_date_range_ignores_invalid_last_line(self):
+        self.assertEqual(extract_logs.get_log_date_range(self.mm, len(self.mm)), (20240101, 20240120))
+
+    def test_search_skips_invalid_dates(self):
+        # Interpolate on this small file too, so both search modes see the bogus lines
+        for min_span in (extract_logs.INTERPOLATION_MIN_SPAN, 1024):
+            with mock.patch.object(extract_logs, 'INTERPOLATION_MIN_SPAN', min_span):
+                for target in ('2023-12-31', '2024-01-01', '2024-01-07', '2024-01-20', '2024-01-21'):
+                    key = int(target.replace('-', ''))
+                    position = extract_logs.binary_search_date(self.mm, key, len(self.mm),
+                                                               20240101, 20240120)
+                    self.assertEqual(position, self.expected_start(target), target)
+
+
+class FindDaySpansTest(unittest.TestCase):
+    LINES = [
+        b'2024-01-02 a\n',
+        b'   continuation of a\n',
+        b'2024-01-01 b\n',
+        b'1234-56-7890 stack frame id\n',
+        b'2024-02-30 still b\n',
+        b'2024- 1-02 still b\n',
+        b'2024-01-0\n',
+        b'2024-01-02 c\n',
+        b'2024-01-02 d\n',
+        b'2024-01-02',
+    ]
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix='.log')
+        os.close(fd)
+        write_log(self.path, self.LINES)
+        self.f = open(self.path, 'rb')
+        self.mm = mmap.mmap(self.f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def tearDown(self):
+        self.mm.close()
+        self.f.close()
+        os.remove(self.path)
+
+    def python_spans(self, target_key):
+        with mock.patch.object(extract_logs, '_load_kernel', return_value=None):
+            return extract_logs.find_day_spans(self.mm, [target_key])[target_key]
+
+    def test_python_spans(self):
+        data = b''.join(self.LINES)
+        first_end = len(self.LINES[0]) + len(self.LINES[1])
+        c_start = data.index(b'2024-01-02 c')
+        self.assertEqual(self.python_spans(20240102), [(0, first_end), (c_start, len(data))])
+        self.assertEqual(self.python_spans(20240101), [(first_end, c_start)])
+
+    def test_python_spans_for_several_dates(self):
+        with mock.patch.object(extract_logs, '_load_kernel', return_value=None):
+            spans = extract_logs.find_day_spans(self.mm, [20240101, 20240102, 20240103])
+        self.assertEqual(spans, {20240101: self.python_spans(20240101),
+                                 20240102: self.python_spans(20240102),
+                                 20240103: []})
+
+    @unittest.skipIf(extract_logs._load_kernel() is None, 'numba is not installed')
+    def test_jit_kernel_matches_python(self):
+        target_keys = [20240103, 20240101, 20240102]
+        with mock.patch.object(extract_logs, '_load_kernel', return_value=None):
+            expected = extract_logs.find_day_spans(self.mm, target_keys)
+        self.assertEqual(extract_logs.find_day_spans(self.mm, target_keys), expected)
+
+
+class ExtractLogsForDateTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'logs.log')
+        self.output = os.path.join(self.tmp.name, 'out.txt')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def extract(self, data, direct_io=False):
+        write_log(self.path, [data])
+        with open(self.path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            count = extract_logs.extract_logs_for_date(f, mm, 0, len(mm), self.output,
+                                                       direct_io=direct_io)
+        with open(self.output, 'rb') as out:
+            self.assertEqual(out.read(), data)
+        return count
+
+    def test_counts_unterminated_last_line(self):
+        data = b''.join(b'2024-01-01 entry %d\n' % i for i in range(99)) + b'2024-01-01 last'
+        self.assertEqual(self.extract(data), 100)
+        self.assertEqual(self.extract(data, direct_io=True), 100)
+
+    def test_counts_continuation_lines(self):
+        self.assertEqual(self.extract(b'2024-01-01 a\n  more\n2024-01-01 b\n'), 3)
+
+
+
+class GetTargetDatesTest(unittest.TestCase):
+    def parse(self, *argv):
+        with mock.patch.object(sys, 'argv', ['extract_logs.py', *argv]):
+            return extract_logs.get_target_dates(extract_logs.parse_arguments())
+
+    def test_range_is_inclusive(self):
+        targets = self.parse('--from', '2024-01-30', '--to', '2024-02-02')
+        self.assertEqual([date_str for date_str, _ in targets],
+                         ['2024-01-30', '2024-01-31', '2024-02-01', '2024-02-02'])
+
+    def test_reversed_range_is_rejected(self):
+        with mock.patch('builtins.print') as print_mock, self.assertRaises(SystemExit):
+            self.parse('--from', '2024-01-05', '--to', '2024-01-01')
+        print_mock.assert_called_once_with("Error: --from must not be after --to.")
+
+
+if __name__ == '__main__':
+    unittest.main()